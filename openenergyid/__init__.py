@@ -1,8 +1,31 @@
 """Open Energy ID Python SDK."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.28"
 
 from .enums import Granularity
-from .models import TimeDataFrame, TimeSeries
+
+if TYPE_CHECKING:
+    from .models import TimeDataFrame, TimeSeries
+
+# Re-exports that pull in pandas/polars/pydantic are resolved on first access (PEP 562)
+_LAZY_IMPORTS = {
+    "TimeDataFrame": ".models",
+    "TimeSeries": ".models",
+}
 
 __all__ = ["Granularity", "TimeDataFrame", "TimeSeries"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,22 @@
 """Baseload analysis package for power consumption data."""
 
-from .models import PowerReadingSchema, PowerSeriesSchema, BaseloadResultSchema
-from .analysis import BaseloadAnalyzer
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .exceptions import InsufficientDataError, InvalidDataError
 
+if TYPE_CHECKING:
+    from .analysis import BaseloadAnalyzer
+    from .models import BaseloadResultSchema, PowerReadingSchema, PowerSeriesSchema
+
+# Polars and pandera are only imported once one of these is accessed (PEP 562)
+_LAZY_IMPORTS = {
+    "BaseloadAnalyzer": ".analysis",
+    "PowerReadingSchema": ".models",
+    "PowerSeriesSchema": ".models",
+    "BaseloadResultSchema": ".models",
+}
+
 __version__ = "0.1.0"
 __all__ = [
     "BaseloadAnalyzer",
@@ -13,3 +26,15 @@ __all__ = [
     "PowerSeriesSchema",
     "BaseloadResultSchema",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -6,8 +6,18 @@ It uses sophisticated time-series analysis to detect consistent minimum power dr
 that represent always-on devices and systems.
 """
 
+from collections.abc import Iterable
+from typing import Any
+
 import polars as pl
 
+# A 15-minute reading of P watts is P * 0.25h / 1000 = P * 0.00025 kWh
+KWH_PER_WATT_READING = 0.00025
+# A 15-minute energy reading of E kWh is an average power of E * 4 * 1000 = E * 4000 W
+WATT_PER_KWH_READING = 4000.0
+# Polars 1.25 deprecated collect(streaming=True) in favour of collect(engine="streaming")
+_STREAMING_ENGINE_ARGUMENT = tuple(int(part) for part in pl.__version__.split(".")[:2]) >= (1, 25)
+
 
 class BaseloadAnalyzer:
     """Analyzes power consumption data to determine baseload characteristics.
@@ -45,8 +55,40 @@ class BaseloadAnalyzer:
     def __init__(self, timezone: str, quantile: float = 0.05):
         self.quantile = quantile
         self.timezone = timezone
+        # Daily baseload plan of the last analyzed power series: (input, quantile, plan)
+        self._daily_cache: tuple[pl.LazyFrame, float, pl.LazyFrame] | None = None
+
+        col = pl.col
+        # The reporting-period metrics do not depend on the call arguments,
+        # so their expressions are built once and reused by every analyze() call
+        self._agg_exprs = (
+            # Energy calculations:
+            # Each 15min power reading (watts) represents 0.25 hours
+            # Convert to kWh: watts * 0.25h * (1kW/1000W) = watts * 0.00025
+            (col("daily_baseload").sum() * KWH_PER_WATT_READING).alias(
+                "consumption_due_to_baseload_in_kilowatthour"
+            ),
+            (col("power").sum() * KWH_PER_WATT_READING).alias("total_consumption_in_kilowatthour"),
+            # Average power levels during the period
+            col("daily_baseload").mean().alias("average_daily_baseload_in_watt"),
+            col("power").mean().alias("average_power_in_watt"),
+        )
+        self._post_exprs = (
+            # Energy consumed above baseload level
+            (
+                col("total_consumption_in_kilowatthour")
+                - col("consumption_due_to_baseload_in_kilowatthour")
+            ).alias("consumption_not_due_to_baseload_in_kilowatthour"),
+            # What fraction of total energy was from baseload
+            (
+                col("consumption_due_to_baseload_in_kilowatthour")
+                / col("total_consumption_in_kilowatthour")
+            ).alias("baseload_ratio"),
+        )
 
-    def prepare_power_seriespolars(self, energy_lf: pl.LazyFrame) -> pl.LazyFrame:
+    def prepare_power_seriespolars(
+        self, energy_lf: pl.LazyFrame, assume_sorted: bool = False
+    ) -> pl.LazyFrame:
         """Converts energy readings into a power consumption time series.
 
         Transforms 15-minute energy readings (kilowatt-hours) into instantaneous
@@ -56,9 +98,16 @@ class BaseloadAnalyzer:
         ----------
         energy_lf : pl.LazyFrame
             Input energy data with columns:
-            - timestamp: Datetime with timezone (e.g. "2023-01-01T00:00:00+01:00")
+            - timestamp: Datetime with timezone (e.g. "2023-01-01T00:00:00+01:00").
+              Naive timestamps are interpreted as UTC.
             - total: Energy readings in kilowatt-hours (kWh)
 
+        assume_sorted : bool, default=False
+            Set to True when the readings are known to be in chronological order
+            (e.g. meter data from the production ingestion pipeline). The series is
+            then only flagged as sorted instead of being sorted, which removes a full
+            sort from the lazy plan. Passing unordered data with True gives wrong results.
+
         Returns
         -------
         pl.LazyFrame
@@ -74,22 +123,29 @@ class BaseloadAnalyzer:
         - Multiply by 4 to convert from 15-minute to hourly rate
         - Multiply by 1000 to convert from kilowatts to watts
         """
-        return (
-            energy_lf.with_columns(
-                [
-                    # Convert timezone
-                    pl.col("timestamp")
-                    .dt.replace_time_zone("UTC")
-                    .dt.convert_time_zone(self.timezone)
-                    .alias("timestamp"),
-                    # Convert to watts and clip negative values
-                    (pl.col("total") * 4000).clip(0).alias("power"),
-                ]
-            )
-            .drop("total")
-            .sort("timestamp")
+        col = pl.col
+
+        # Only emit the timezone conversions the input actually needs
+        time_zone = energy_lf.collect_schema()["timestamp"].time_zone
+        timestamp = col("timestamp")
+        if time_zone is None:
+            # Naive timestamps are interpreted as UTC
+            timestamp = timestamp.dt.replace_time_zone("UTC")
+        if time_zone != self.timezone:
+            timestamp = timestamp.dt.convert_time_zone(self.timezone)
+
+        # Project both output columns in a single node instead of adding and dropping columns
+        power_lf = energy_lf.select(
+            # Convert timezone
+            timestamp.alias("timestamp"),
+            # Convert to watts and clip negative values
+            (col("total") * WATT_PER_KWH_READING).clip(lower_bound=0.0).alias("power"),
         )
 
+        if assume_sorted:
+            return power_lf.set_sorted("timestamp")
+        return power_lf.sort("timestamp")
+
     def analyze(self, power_lf: pl.LazyFrame, reporting_granularity: str = "1h") -> pl.LazyFrame:
         """Analyze power consumption data to calculate baseload and total energy metrics.
 
@@ -107,7 +163,8 @@ class BaseloadAnalyzer:
         ----------
         power_lf : pl.LazyFrame
             Power consumption data with columns:
-            - timestamp: Datetime in configured timezone
+            - timestamp: Datetime in configured timezone, sorted ascending
+              (as returned by `prepare_power_seriespolars`)
             - power: Power readings in watts
 
         reporting_granularity : str, default="1h"
@@ -125,49 +182,155 @@ class BaseloadAnalyzer:
             - average_daily_baseload_in_watt: Average baseload power level
             - average_power_in_watt: Average total power
             - baseload_ratio: Fraction of energy from baseload
+
+        Notes
+        -----
+        For multi-year series, use `analyze_collect` to collect the returned plan on
+        Polars' streaming engine and keep memory usage bounded.
+
+        The daily baseload step of the last analyzed frame is cached (see `clear_cache`). When
+        analyzing the same power series at several granularities, use `analyze_all` so
+        the daily baseload is only computed once.
         """
-        # Step 1: Calculate the daily baseload level
-        # Group power readings by day and find the threshold power level that represents baseload
-        daily_baseload = power_lf.group_by_dynamic("timestamp", every="1d").agg(
-            pl.col("power").quantile(self.quantile).alias("daily_baseload")
-        )
+        if reporting_granularity == "1d":
+            return self._analyze_daily(power_lf)
 
-        # Step 2 & 3: Join baseload data and aggregate metrics
         return (
-            # Join the daily baseload level with original power readings
-            # Using asof join since baseload changes daily but readings are every 15min
-            power_lf.join_asof(daily_baseload, on="timestamp")
+            # Step 1 & 2: Calculate the daily baseload level and join it with the readings
+            self._with_daily_baseload(power_lf)
+            # Step 3: Aggregate metrics
             # Group into requested reporting periods
             .group_by_dynamic("timestamp", every=reporting_granularity)
+            .agg(*self._agg_exprs)
+            # Calculate derived metrics
+            .with_columns(*self._post_exprs)
+        )
+
+    def analyze_collect(
+        self,
+        power_lf: pl.LazyFrame,
+        reporting_granularity: str = "1h",
+        streaming: bool = False,
+    ) -> pl.DataFrame:
+        """Analyze the power series and collect the results.
+
+        Parameters
+        ----------
+        power_lf : pl.LazyFrame
+            Power consumption data, see `analyze`
+        reporting_granularity : str, default="1h"
+            Time period for aggregating results, see `analyze`
+        streaming : bool, default=False
+            Whether to collect on Polars' streaming engine, which processes the series in
+            chunks instead of materializing it at once. Recommended for multi-year series.
+
+        Returns
+        -------
+        pl.DataFrame
+            Analysis results per reporting period, see `analyze`
+        """
+        results_lf = self.analyze(power_lf, reporting_granularity=reporting_granularity)
+        return results_lf.collect(**self._collect_options(streaming))
+
+    def analyze_all(
+        self,
+        power_lf: pl.LazyFrame,
+        reporting_granularities: Iterable[str] = ("1h", "1d", "1mo"),
+        streaming: bool = False,
+    ) -> dict[str, pl.DataFrame]:
+        """Analyze the power series at several reporting granularities at once.
+
+        The plans are collected together with ``pl.collect_all``, so they run in parallel
+        and the shared input and daily baseload steps are only evaluated once.
+
+        Parameters
+        ----------
+        power_lf : pl.LazyFrame
+            Power consumption data, see `analyze`
+        reporting_granularities : Iterable[str], default=("1h", "1d", "1mo")
+            Time periods for aggregating results, see `analyze`
+        streaming : bool, default=False
+            Whether to collect on Polars' streaming engine, see `analyze_collect`
+
+        Returns
+        -------
+        dict[str, pl.DataFrame]
+            Analysis results per reporting period, keyed by reporting granularity
+        """
+        granularities = list(dict.fromkeys(reporting_granularities))
+        results = pl.collect_all(
+            [self.analyze(power_lf, reporting_granularity=g) for g in granularities],
+            **self._collect_options(streaming),
+        )
+        return dict(zip(granularities, results))
+
+    @staticmethod
+    def _collect_options(streaming: bool) -> dict[str, Any]:
+        """Collect arguments selecting the streaming engine for the installed Polars version."""
+        if not streaming:
+            return {}
+        if _STREAMING_ENGINE_ARGUMENT:
+            return {"engine": "streaming"}
+        return {"streaming": True}
+
+    def _analyze_daily(self, power_lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Specialized analysis plan for a daily reporting granularity.
+
+        The reporting periods coincide with the baseload days, so the daily baseload is a
+        plain aggregate of each period: no join, a single group_by_dynamic.
+        """
+        col = pl.col
+        daily_baseload = col("power").quantile(self.quantile)
+        return (
+            power_lf.group_by_dynamic("timestamp", every="1d")
             .agg(
-                [
-                    # Energy calculations:
-                    # Each 15min power reading (watts) represents 0.25 hours
-                    # Convert to kWh: watts * 0.25h * (1kW/1000W)
-                    (pl.col("daily_baseload").sum() * 0.25 / 1000).alias(
-                        "consumption_due_to_baseload_in_kilowatthour"
-                    ),
-                    (pl.col("power").sum() * 0.25 / 1000).alias(
-                        "total_consumption_in_kilowatthour"
-                    ),
-                    # Average power levels during the period
-                    pl.col("daily_baseload").mean().alias("average_daily_baseload_in_watt"),
-                    pl.col("power").mean().alias("average_power_in_watt"),
-                ]
+                (col("power").sum() * KWH_PER_WATT_READING).alias(
+                    "total_consumption_in_kilowatthour"
+                ),
+                daily_baseload.alias("average_daily_baseload_in_watt"),
+                col("power").mean().alias("average_power_in_watt"),
+                pl.len().alias("readings"),
             )
-            # Calculate derived metrics
-            .with_columns(
-                [
-                    # Energy consumed above baseload level
-                    (
-                        pl.col("total_consumption_in_kilowatthour")
-                        - pl.col("consumption_due_to_baseload_in_kilowatthour")
-                    ).alias("consumption_not_due_to_baseload_in_kilowatthour"),
-                    # What fraction of total energy was from baseload
-                    (
-                        pl.col("consumption_due_to_baseload_in_kilowatthour")
-                        / pl.col("total_consumption_in_kilowatthour")
-                    ).alias("baseload_ratio"),
-                ]
+            .select(
+                "timestamp",
+                # Every reading of the day carries the same baseload, so its energy is
+                # baseload * number of readings * 0.25h / 1000, computed once per day
+                # from the aggregated columns rather than inside the group aggregation.
+                # A day without power readings has no baseload; like the sum in the
+                # generic plan, its baseload energy is 0 rather than null
+                (col("average_daily_baseload_in_watt") * col("readings") * KWH_PER_WATT_READING)
+                .fill_null(0.0)
+                .alias("consumption_due_to_baseload_in_kilowatthour"),
+                "total_consumption_in_kilowatthour",
+                "average_daily_baseload_in_watt",
+                "average_power_in_watt",
             )
+            .with_columns(*self._post_exprs)
         )
+
+    def _with_daily_baseload(self, power_lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Attach the daily baseload power level to every reading of the power series.
+
+        The plan of the last input frame is cached, and marked as a cache node so plans built
+        on top of it share a single evaluation when collected together. Only one entry is
+        kept, so an analyzer reused over many series holds on to at most one of them.
+        """
+        cached = self._daily_cache
+        if cached is not None and cached[0] is power_lf and cached[1] == self.quantile:
+            return cached[2]
+
+        # Group power readings by day and find the threshold power level that represents baseload
+        daily_baseload = power_lf.group_by_dynamic("timestamp", every="1d").agg(
+            pl.col("power").quantile(self.quantile).alias("daily_baseload")
+        )
+        daily_lf = (
+            # Join the daily baseload level with original power readings
+            # Using asof join since baseload changes daily but readings are every 15min
+            power_lf.join_asof(daily_baseload, on="timestamp").cache()
+        )
+        self._daily_cache = (power_lf, self.quantile, daily_lf)
+        return daily_lf
+
+    def clear_cache(self) -> None:
+        """Drop the cached daily baseload plan and the power series it references."""
+        self._daily_cache = None
@@ -1,7 +1,9 @@
 """Main module for capacity analysis."""
 
+import bisect
 import datetime as dt
 import typing
+import numpy as np
 import pandas as pd
 import pandera.typing as pdt
 
@@ -50,14 +52,32 @@ class CapacityAnalysis:
         Returns:
             pd.Series: A Pandas Series containing the peaks
         """
-        # Group by the specified window (default is month start)
-        grouped = self.data.groupby(pd.Grouper(freq=self.window))
-
-        # Find the index (timestamp) of the maximum value in each group
-        peak_indices = grouped.idxmax()
-
-        # Get the corresponding peak values
-        peaks = self.data.loc[peak_indices][self.data > self.threshold]
+        data = self.data if self.data.index.is_monotonic_increasing else self.data.sort_index()
+        values = data.to_numpy(dtype=np.float64)
+
+        # Count the readings per window (default is month start). The windows are contiguous
+        # runs of the sorted series, so their positional bounds follow from a cumulative sum
+        counts = data.resample(self.window).size().to_numpy()
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        # Skip windows without readings; the remaining windows are back to back, so each
+        # reduceat segment below runs from one window start to the next
+        non_empty = counts > 0
+        starts, counts = starts[non_empty], counts[non_empty]
+        if len(starts) == 0:
+            return data.iloc[[]]
+
+        # Find the maximum value in each window and the first position that reaches it.
+        # Missing values never win, and a window with only missing values has a -inf maximum
+        filled = np.where(np.isnan(values), -np.inf, values)
+        window_max = np.maximum.reduceat(filled, starts)
+        positions = np.where(
+            filled == np.repeat(window_max, counts), np.arange(len(values)), len(values)
+        )
+        peak_positions = np.minimum.reduceat(positions, starts)
+
+        # Keep the peaks above the threshold, comparing only the peak values
+        peaks = data.iloc[peak_positions[window_max > self.threshold]]
         return peaks
 
     def find_peaks_with_surroundings(
@@ -72,31 +92,78 @@ class CapacityAnalysis:
         Returns:
             List[tuple[dt.datetime,float,pd.Series]]: A list of tuples containing peak time, peak value, and surrounding data.
         """
-        peaks = self.data.nlargest(num_peaks * 2)
-        peaks = peaks[peaks > self.threshold]
-        if peaks.empty:
+        values = self.data.to_numpy(dtype=np.float64)
+        # Only readings above the threshold can be peaks, and there are typically few of
+        # them, so filter before selecting the largest values
+        above = np.flatnonzero(values > self.threshold)
+        positions = above[self._largest_positions(values[above], num_peaks * 2)]
+        if len(positions) == 0:
             return []
 
         result = []
-        window_size = dt.timedelta(minutes=15 * (2 * self.x_padding + 1))
-
-        for peak_time, peak_value in peaks.items():
-            peak_time = typing.cast(pd.Timestamp, peak_time)
-
-            if any(abs(peak_time - prev_peak[0]) < window_size for prev_peak in result):
+        # Work on int64 nanosecond timestamps, so the distance checks between peaks and the
+        # lookup of the surrounding data are integer comparisons and binary searches
+        data_times = self.data.index.asi8
+        peak_times = data_times[positions]
+        window_size = pd.Timedelta(minutes=15 * (2 * self.x_padding + 1)).value
+        before = pd.Timedelta(minutes=15 * self.x_padding).value
+        after = pd.Timedelta(minutes=15 * (self.x_padding + 1)).value
+        # Positional bounds of the label slices [peak - before, peak + after] of all candidates.
+        # These are searched on time rather than derived from a fixed number of readings,
+        # so gaps in the series are handled the same way as by label slicing
+        starts = data_times.searchsorted(peak_times - before, side="left")
+        ends = data_times.searchsorted(peak_times + after, side="right")
+        # Times of the selected peaks, kept sorted so only the nearest neighbours of a
+        # candidate need to be checked
+        selected_times: list[int] = []
+
+        for i, peak_ns in enumerate(peak_times.tolist()):
+            # Skip peaks too close to an already selected (higher) peak
+            j = bisect.bisect_left(selected_times, peak_ns)
+            if (j > 0 and peak_ns - selected_times[j - 1] < window_size) or (
+                j < len(selected_times) and selected_times[j] - peak_ns < window_size
+            ):
                 continue
+            selected_times.insert(j, peak_ns)
 
-            start_time = peak_time - dt.timedelta(minutes=15 * self.x_padding)
-            end_time = peak_time + dt.timedelta(minutes=15 * (self.x_padding + 1))
-            surrounding_data = self.data[start_time:end_time]
+            position = positions[i]
+            surrounding_data = self.data.iloc[starts[i] : ends[i]]
 
             result.append(
                 [
-                    peak_time,
-                    peak_value,
+                    typing.cast(pd.Timestamp, self.data.index[position]),
+                    values[position],
                     surrounding_data,
                 ]
             )
             if len(result) == num_peaks:
                 break
         return result
+
+    @staticmethod
+    def _largest_positions(values: np.ndarray, n: int) -> np.ndarray:
+        """
+        Finds the positions of the n largest values, like pandas' nlargest.
+
+        Uses a partial sort (introselect) instead of sorting the whole series, and only sorts
+        the selected values. Missing values are skipped and ties keep their original order.
+
+        Parameters:
+            values (np.ndarray): The values to search.
+            n (int): The number of positions to return.
+
+        Returns:
+            np.ndarray: The positions of the n largest values, largest first.
+        """
+        if n <= 0:
+            return np.empty(0, dtype=np.intp)
+        positions = np.flatnonzero(~np.isnan(values))
+        if len(positions) > n:
+            candidates = values[positions]
+            # The n-th largest value; ties at this cutoff are resolved by position
+            cutoff = -np.partition(-candidates, n - 1)[n - 1]
+            above = positions[candidates > cutoff]
+            at_cutoff = positions[candidates == cutoff][: n - len(above)]
+            positions = np.concatenate([above, at_cutoff])
+        # Sort by descending value, then by ascending position
+        return positions[np.lexsort((positions, -values[positions]))]
@@ -1,6 +1,8 @@
 """Model for Capacity Analysis."""
 
 import datetime as dt
+from collections.abc import Iterable
+import pandas as pd
 from pydantic import BaseModel, ConfigDict, Field
 from openenergyid.models import TimeSeries
 
@@ -21,6 +23,24 @@ class PeakDetail(BaseModel):
     surrounding_data: TimeSeries = Field(alias="surroundingData")
     model_config = ConfigDict(populate_by_name=True)
 
+    @classmethod
+    def from_peaks(
+        cls, peaks: Iterable[tuple[dt.datetime, float, pd.Series]]
+    ) -> list["PeakDetail"]:
+        """Create peak details from the output of `CapacityAnalysis.find_peaks_with_surroundings`.
+
+        The peaks come from an analysis of validated input, so the models are built
+        without re-validating every field.
+        """
+        return [
+            cls.model_construct(
+                peak_time=peak_time,
+                peak_value=peak_value,
+                surrounding_data=TimeSeries.from_pandas(surrounding_data),
+            )
+            for peak_time, peak_value, surrounding_data in peaks
+        ]
+
 
 class CapacityOutput(BaseModel):
     """Model for capacity output"""
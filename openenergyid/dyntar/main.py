@@ -1,6 +1,7 @@
 """Main module of the DynTar package."""
 
 from typing import cast
+import numpy as np
 import pandas as pd
 
 from openenergyid.const import (
@@ -31,20 +32,83 @@ from .const import (
     HEATMAP_TOTAL_DESCRIPTION,
     Register,
 )
+from .models import RequiredColumns
 
 
-def weigh_by_monthly_profile(df: pd.DataFrame, series_name, profile_name) -> pd.Series:
-    """Weigh a time series by a monthly profile."""
-    grouped = df.groupby(pd.Grouper(freq="MS"))
-    return grouped[series_name].transform("sum") * grouped[profile_name].transform(
-        lambda x: x / x.sum()
-    )
+def _month_starts(index: pd.Index) -> np.ndarray:
+    """Positions in a sorted DatetimeIndex where a new calendar month starts."""
+    index = cast(pd.DatetimeIndex, index)
+    if len(index) == 0:
+        return np.empty(0, dtype=np.intp)
+    # Months are counted in the timezone of the index, like a "MS" grouper
+    months = index.year.to_numpy() * 12 + index.month.to_numpy()
+    return np.concatenate([[0], np.flatnonzero(np.diff(months)) + 1])
+
+
+def _sort_order(index: pd.Index) -> np.ndarray | None:
+    """Positions that sort a DatetimeIndex, or None when it is already sorted."""
+    if index.is_monotonic_increasing:
+        return None
+    return np.argsort(cast(pd.DatetimeIndex, index).asi8, kind="stable")
+
+
+def _restore_order(values: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Put values computed on the sorted rows back in the original row order."""
+    restored = np.empty_like(values)
+    restored[order] = values
+    return restored
+
+
+def _float_values(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Values of a column as a floating point array, keeping float32 columns in float32."""
+    values = df[name].to_numpy()
+    if values.dtype.kind != "f":
+        values = values.astype(np.float64)
+    return values
+
+
+def _monthly_sum(values: np.ndarray, month_starts: np.ndarray) -> np.ndarray:
+    """Sum values per month, skipping missing values."""
+    return np.add.reduceat(np.where(np.isnan(values), 0.0, values), month_starts)
+
+
+def _broadcast_monthly(monthly: np.ndarray, month_starts: np.ndarray, length: int) -> np.ndarray:
+    """Repeat one value per month for every row of that month."""
+    return np.repeat(monthly, np.diff(month_starts, append=length))
+
+
+def weigh_by_monthly_profile(
+    df: pd.DataFrame, series_name, profile_name, month_starts: np.ndarray | None = None
+) -> pd.Series:
+    """Weigh a time series by a monthly profile.
+
+    The month segmentation of a sorted DataFrame can be passed in as `month_starts` to
+    share it between calls on the same DataFrame. An unsorted DataFrame is weighed on a
+    sorted working copy, and the result keeps the original row order.
+    """
+    order = _sort_order(df.index)
+    if order is not None:
+        weighted = weigh_by_monthly_profile(df.iloc[order], series_name, profile_name)
+        return pd.Series(_restore_order(weighted.to_numpy(), order), index=df.index)
+
+    if month_starts is None:
+        month_starts = _month_starts(df.index)
+    profile = _float_values(df, profile_name)
+    # Share of the monthly total per unit of profile. A month whose profile sums to 0 gives
+    # inf or NaN without a warning, like the pandas arithmetic it replaces
+    with np.errstate(divide="ignore", invalid="ignore"):
+        monthly_factor = _monthly_sum(_float_values(df, series_name), month_starts) / _monthly_sum(
+            profile, month_starts
+        )
+        weighted = _broadcast_monthly(monthly_factor, month_starts, len(df)) * profile
+    return pd.Series(weighted, index=df.index)
 
 
 def extend_dataframe_with_smr2(
     df: pd.DataFrame,
     inplace: bool = False,
     registers: list[Register] | None = None,
+    month_starts: np.ndarray | None = None,
 ) -> pd.DataFrame | None:
     """Extend a DataFrame with the SMR2 columns."""
     if not inplace:
@@ -55,22 +119,27 @@ def extend_dataframe_with_smr2(
     if registers is None:
         registers = [Register.DELIVERY, Register.EXPORT]
 
+    # An unsorted index is sorted by weigh_by_monthly_profile itself
+    if month_starts is None and df.index.is_monotonic_increasing:
+        month_starts = _month_starts(df.index)
+
     if Register.DELIVERY in registers:
         result_df[ELECTRICITY_DELIVERED_SMR2] = weigh_by_monthly_profile(
-            df, ELECTRICITY_DELIVERED, RLP
+            df, ELECTRICITY_DELIVERED, RLP, month_starts=month_starts
         )
     if Register.EXPORT in registers:
         result_df[ELECTRICITY_EXPORTED_SMR2] = weigh_by_monthly_profile(
-            df, ELECTRICITY_EXPORTED, SPP
+            df, ELECTRICITY_EXPORTED, SPP, month_starts=month_starts
         )
 
-    result_df.rename(
-        columns={
-            ELECTRICITY_DELIVERED: ELECTRICITY_DELIVERED_SMR3,
-            ELECTRICITY_EXPORTED: ELECTRICITY_EXPORTED_SMR3,
-        },
-        inplace=True,
-        errors="ignore",
+    # Remap the measured columns to their SMR3 names without going through rename
+    smr3_names = {
+        ELECTRICITY_DELIVERED: ELECTRICITY_DELIVERED_SMR3,
+        ELECTRICITY_EXPORTED: ELECTRICITY_EXPORTED_SMR3,
+    }
+    result_df.columns = pd.Index(
+        [smr3_names.get(column, column) for column in result_df.columns],
+        name=result_df.columns.name,
     )
 
     if not inplace:
@@ -78,6 +147,13 @@ def extend_dataframe_with_smr2(
     return None
 
 
+def _export_cost(energy: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """Cost of exported energy, negated in place instead of multiplying by -1."""
+    cost = energy * price
+    np.negative(cost, out=cost)
+    return cost
+
+
 def extend_dataframe_with_costs(
     df: pd.DataFrame, inplace: bool = False, registers: list[Register] | None = None
 ) -> pd.DataFrame | None:
@@ -91,19 +167,21 @@ def extend_dataframe_with_costs(
         registers = [Register.DELIVERY, Register.EXPORT]
 
     if Register.DELIVERY in registers:
+        price = df[PRICE_ELECTRICITY_DELIVERED].to_numpy()
         result_df[COST_ELECTRICITY_DELIVERED_SMR2] = (
-            df[ELECTRICITY_DELIVERED_SMR2] * df[PRICE_ELECTRICITY_DELIVERED]
+            df[ELECTRICITY_DELIVERED_SMR2].to_numpy() * price
         )
         result_df[COST_ELECTRICITY_DELIVERED_SMR3] = (
-            df[ELECTRICITY_DELIVERED_SMR3] * df[PRICE_ELECTRICITY_DELIVERED]
+            df[ELECTRICITY_DELIVERED_SMR3].to_numpy() * price
         )
 
     if Register.EXPORT in registers:
-        result_df[COST_ELECTRICITY_EXPORTED_SMR2] = (
-            df[ELECTRICITY_EXPORTED_SMR2] * df[PRICE_ELECTRICITY_EXPORTED] * -1
+        price = df[PRICE_ELECTRICITY_EXPORTED].to_numpy()
+        result_df[COST_ELECTRICITY_EXPORTED_SMR2] = _export_cost(
+            df[ELECTRICITY_EXPORTED_SMR2].to_numpy(), price
         )
-        result_df[COST_ELECTRICITY_EXPORTED_SMR3] = (
-            df[ELECTRICITY_EXPORTED_SMR3] * df[PRICE_ELECTRICITY_EXPORTED] * -1
+        result_df[COST_ELECTRICITY_EXPORTED_SMR3] = _export_cost(
+            df[ELECTRICITY_EXPORTED_SMR3].to_numpy(), price
         )
 
     if not inplace:
@@ -111,8 +189,36 @@ def extend_dataframe_with_costs(
     return None
 
 
+def _monthly_weighted_price(
+    df: pd.DataFrame,
+    price_name: str,
+    profile_name: str,
+    month_starts: np.ndarray,
+    order: np.ndarray | None = None,
+) -> np.ndarray:
+    """Profile-weighted average price of each month, repeated for every row of the month.
+
+    `df` must be sorted. When it is a sorted working copy, `order` is the sort order of
+    the original frame, and the result is returned in the original row order.
+    """
+    price = _float_values(df, price_name)
+    profile = _float_values(df, profile_name)
+    # A month whose profile sums to 0 gives NaN or inf without a warning, like pandas would
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted_price = _monthly_sum(price * profile, month_starts) / _monthly_sum(
+            profile, month_starts
+        )
+    weighted_price = _broadcast_monthly(weighted_price, month_starts, len(df))
+    if order is not None:
+        weighted_price = _restore_order(weighted_price, order)
+    return weighted_price
+
+
 def extend_dataframe_with_weighted_prices(
-    df: pd.DataFrame, inplace: bool = False, registers: list[Register] | None = None
+    df: pd.DataFrame,
+    inplace: bool = False,
+    registers: list[Register] | None = None,
+    month_starts: np.ndarray | None = None,
 ) -> pd.DataFrame | None:
     """Extend a DataFrame with the weighted price columns."""
     if not inplace:
@@ -121,20 +227,20 @@ def extend_dataframe_with_weighted_prices(
     if registers is None:
         registers = [Register.DELIVERY, Register.EXPORT]
 
+    # An unsorted index is handled on a sorted working copy
+    order = _sort_order(df.index)
+    sorted_df = df if order is None else df.iloc[order]
+    if month_starts is None or order is not None:
+        month_starts = _month_starts(sorted_df.index)
+
     if Register.DELIVERY in registers:
-        rlp_weighted_price_delivered = (df[PRICE_ELECTRICITY_DELIVERED] * df[RLP]).resample(
-            "MS"
-        ).sum() / df[RLP].resample("MS").sum()
-        df[RLP_WEIGHTED_PRICE_DELIVERED] = rlp_weighted_price_delivered.reindex_like(
-            df[RLP], method="ffill"
+        df[RLP_WEIGHTED_PRICE_DELIVERED] = _monthly_weighted_price(
+            sorted_df, PRICE_ELECTRICITY_DELIVERED, RLP, month_starts, order
         )
 
     if Register.EXPORT in registers:
-        spp_weighted_price_exported = (df[PRICE_ELECTRICITY_EXPORTED] * df[SPP]).resample(
-            "MS"
-        ).sum() / df[SPP].resample("MS").sum()
-        df[SPP_WEIGHTED_PRICE_EXPORTED] = spp_weighted_price_exported.reindex_like(
-            df[SPP], method="ffill"
+        df[SPP_WEIGHTED_PRICE_EXPORTED] = _monthly_weighted_price(
+            sorted_df, PRICE_ELECTRICITY_EXPORTED, SPP, month_starts, order
         )
 
     if not inplace:
@@ -142,6 +248,19 @@ def extend_dataframe_with_weighted_prices(
     return None
 
 
+def _heatmap_score(
+    df: pd.DataFrame, smr2_name: str, smr3_name: str, weighted_price_name: str, price_name: str
+) -> np.ndarray:
+    """Energy delta times price delta between SMR2 and SMR3, with missing scores set to 0.
+
+    The arithmetic runs in place on a single buffer, without intermediate Series.
+    """
+    score = np.subtract(_float_values(df, smr2_name), _float_values(df, smr3_name))
+    score *= _float_values(df, weighted_price_name) - _float_values(df, price_name)
+    np.copyto(score, 0.0, where=np.isnan(score))
+    return score
+
+
 def extend_dataframe_with_heatmap(
     df: pd.DataFrame, inplace: bool = False, registers: list[Register] | None = None
 ) -> pd.DataFrame | None:
@@ -153,24 +272,28 @@ def extend_dataframe_with_heatmap(
         registers = [Register.DELIVERY, Register.EXPORT]
 
     if Register.DELIVERY in registers:
-        energy_delta_delivered = df[ELECTRICITY_DELIVERED_SMR2] - df[ELECTRICITY_DELIVERED_SMR3]
-        price_delta_delivered = df[RLP_WEIGHTED_PRICE_DELIVERED] - df[PRICE_ELECTRICITY_DELIVERED]
-        heatmap_score_delivered = energy_delta_delivered * price_delta_delivered
-        heatmap_score_delivered.fillna(0, inplace=True)
+        heatmap_score_delivered = _heatmap_score(
+            df,
+            ELECTRICITY_DELIVERED_SMR2,
+            ELECTRICITY_DELIVERED_SMR3,
+            RLP_WEIGHTED_PRICE_DELIVERED,
+            PRICE_ELECTRICITY_DELIVERED,
+        )
         # Invert score so that positive values indicate a positive impact
-        heatmap_score_delivered = -heatmap_score_delivered
+        np.negative(heatmap_score_delivered, out=heatmap_score_delivered)
         df[HEATMAP_DELIVERED] = heatmap_score_delivered
 
     if Register.EXPORT in registers:
-        energy_delta_exported = df[ELECTRICITY_EXPORTED_SMR2] - df[ELECTRICITY_EXPORTED_SMR3]
-        price_delta_exported = df[SPP_WEIGHTED_PRICE_EXPORTED] - df[PRICE_ELECTRICITY_EXPORTED]
-        heatmap_score_exported = energy_delta_exported * price_delta_exported
-        heatmap_score_exported.fillna(0, inplace=True)
+        heatmap_score_exported = _heatmap_score(
+            df,
+            ELECTRICITY_EXPORTED_SMR2,
+            ELECTRICITY_EXPORTED_SMR3,
+            SPP_WEIGHTED_PRICE_EXPORTED,
+            PRICE_ELECTRICITY_EXPORTED,
+        )
         df[HEATMAP_EXPORTED] = heatmap_score_exported
 
     if Register.DELIVERY in registers and Register.EXPORT in registers:
-        heatmap_score_delivered = cast(pd.Series, df[HEATMAP_DELIVERED])
-        heatmap_score_exported = cast(pd.Series, df[HEATMAP_EXPORTED])
         heatmap_score_combined = heatmap_score_delivered + heatmap_score_exported
     elif Register.DELIVERY in registers:
         heatmap_score_combined = heatmap_score_delivered
@@ -222,6 +345,38 @@ def map_total_description(
     return exported_description
 
 
+def _classify_description(
+    df: pd.DataFrame,
+    price_name: str,
+    weighted_price_name: str,
+    smr3_name: str,
+    smr2_name: str,
+    offset: int,
+) -> np.ndarray:
+    """Vectorized map_delivery_description (offset 0) and map_export_description (offset 4).
+
+    The codes are returned as int8, as they only range from 0 to 8.
+    """
+    price = df[price_name].to_numpy()
+    weighted_price = df[weighted_price_name].to_numpy()
+    smr3 = df[smr3_name].to_numpy()
+    smr2 = df[smr2_name].to_numpy()
+    price_above = price > weighted_price
+    price_below = price < weighted_price
+    energy_above = smr3 > smr2
+    energy_below = smr3 < smr2
+    return np.select(
+        [
+            price_above & energy_above,
+            price_above & energy_below,
+            price_below & energy_above,
+            price_below & energy_below,
+        ],
+        [np.int8(offset + code) for code in range(1, 5)],
+        default=np.int8(0),
+    )
+
+
 def extend_dataframe_with_heatmap_description(
     df: pd.DataFrame, inplace: bool = False, registers: list[Register] | None = None
 ) -> pd.DataFrame | None:
@@ -233,36 +388,31 @@ def extend_dataframe_with_heatmap_description(
         registers = [Register.DELIVERY, Register.EXPORT]
 
     if Register.DELIVERY in registers:
-        df[HEATMAP_DELIVERED_DESCRIPTION] = list(
-            map(
-                map_delivery_description,
-                df[PRICE_ELECTRICITY_DELIVERED],
-                df[RLP_WEIGHTED_PRICE_DELIVERED],
-                df[ELECTRICITY_DELIVERED_SMR3],
-                df[ELECTRICITY_DELIVERED_SMR2],
-            )
+        df[HEATMAP_DELIVERED_DESCRIPTION] = _classify_description(
+            df,
+            PRICE_ELECTRICITY_DELIVERED,
+            RLP_WEIGHTED_PRICE_DELIVERED,
+            ELECTRICITY_DELIVERED_SMR3,
+            ELECTRICITY_DELIVERED_SMR2,
+            offset=0,
         )
 
     if Register.EXPORT in registers:
-        df[HEATMAP_EXPORTED_DESCRIPTION] = list(
-            map(
-                map_export_description,
-                df[PRICE_ELECTRICITY_EXPORTED],
-                df[SPP_WEIGHTED_PRICE_EXPORTED],
-                df[ELECTRICITY_EXPORTED_SMR3],
-                df[ELECTRICITY_EXPORTED_SMR2],
-            )
+        df[HEATMAP_EXPORTED_DESCRIPTION] = _classify_description(
+            df,
+            PRICE_ELECTRICITY_EXPORTED,
+            SPP_WEIGHTED_PRICE_EXPORTED,
+            ELECTRICITY_EXPORTED_SMR3,
+            ELECTRICITY_EXPORTED_SMR2,
+            offset=4,
         )
 
     if Register.DELIVERY in registers and Register.EXPORT in registers:
-        df[HEATMAP_TOTAL_DESCRIPTION] = list(
-            map(
-                map_total_description,
-                df[HEATMAP_DELIVERED].abs(),
-                df[HEATMAP_EXPORTED].abs(),
-                df[HEATMAP_DELIVERED_DESCRIPTION],
-                df[HEATMAP_EXPORTED_DESCRIPTION],
-            )
+        # Vectorized map_total_description
+        df[HEATMAP_TOTAL_DESCRIPTION] = np.where(
+            np.abs(df[HEATMAP_DELIVERED].to_numpy()) > np.abs(df[HEATMAP_EXPORTED].to_numpy()),
+            df[HEATMAP_DELIVERED_DESCRIPTION].to_numpy(),
+            df[HEATMAP_EXPORTED_DESCRIPTION].to_numpy(),
         )
     elif Register.DELIVERY in registers:
         df[HEATMAP_TOTAL_DESCRIPTION] = df[HEATMAP_DELIVERED_DESCRIPTION]
@@ -271,23 +421,48 @@ def extend_dataframe_with_heatmap_description(
 
     if not inplace:
         return df
+    return None
 
 
 def calculate_dyntar_columns(
     df: pd.DataFrame,
     inplace: bool = False,
     registers: list[Register] | None = None,
+    downcast: bool = False,
 ) -> pd.DataFrame | None:
-    """Calculate all columns required for the dynamic tariff analysis."""
+    """Calculate all columns required for the dynamic tariff analysis.
+
+    With `downcast`, the input columns are converted to float32 first, so every derived
+    column is computed and stored in float32. This halves the memory traffic on long
+    series, at the cost of float32 precision in the results.
+
+    Without `inplace`, the input DataFrame is not modified and the result is a copy of it.
+    When pandas copy-on-write is enabled, that copy is shallow and only the derived
+    columns are newly allocated.
+    """
     if not inplace:
-        df = df.copy()
+        # Under copy-on-write a shallow copy is enough: writes to the result copy the
+        # affected columns instead of changing the input. Without it, the input data
+        # would be shared with the result, so the input is copied in full
+        df = df.copy(deep=pd.options.mode.copy_on_write is not True)
 
     if registers is None:
         registers = [Register.DELIVERY, Register.EXPORT]
 
-    extend_dataframe_with_smr2(df, inplace=True, registers=registers)
+    if downcast:
+        input_columns = [column for column in RequiredColumns.__args__ if column in df.columns]
+        df[input_columns] = df[input_columns].astype(np.float32)
+
+    # The month segmentation is shared by every monthly computation below. An unsorted
+    # index is instead handled by each step on a sorted working copy
+    month_starts = _month_starts(df.index) if df.index.is_monotonic_increasing else None
+
+    # All steps work in place on the single frame above; none of them copies it again
+    extend_dataframe_with_smr2(df, inplace=True, registers=registers, month_starts=month_starts)
     extend_dataframe_with_costs(df, inplace=True, registers=registers)
-    extend_dataframe_with_weighted_prices(df, inplace=True, registers=registers)
+    extend_dataframe_with_weighted_prices(
+        df, inplace=True, registers=registers, month_starts=month_starts
+    )
     extend_dataframe_with_heatmap(df, inplace=True, registers=registers)
     extend_dataframe_with_heatmap_description(df, inplace=True, registers=registers)
 
@@ -298,12 +473,18 @@ def calculate_dyntar_columns(
 
 def summarize_result(df: pd.DataFrame) -> pd.Series:
     """Summarize the dynamic tariff analysis result."""
-    summary = df.filter(like="cost").sum()
+    # Select the columns by name once instead of re-filtering the frame and the summary
+    cost_columns = [column for column in df.columns if "cost" in column]
+    smr2_columns = [column for column in cost_columns if "smr2" in column]
+    smr3_columns = [column for column in cost_columns if "smr3" in column]
+
+    summary = df[cost_columns].sum()
+    smr2_costs = summary[smr2_columns].to_numpy()
 
-    abs_smr2 = summary.filter(like="smr2").abs().sum()
+    abs_smr2 = np.abs(smr2_costs).sum()
 
-    summary["cost_electricity_total_smr2"] = summary.filter(like="smr2").sum()
-    summary["cost_electricity_total_smr3"] = summary.filter(like="smr3").sum()
+    summary["cost_electricity_total_smr2"] = smr2_costs.sum()
+    summary["cost_electricity_total_smr3"] = summary[smr3_columns].to_numpy().sum()
 
     summary["ratio"] = (
         summary["cost_electricity_total_smr3"] - summary["cost_electricity_total_smr2"]
@@ -5,6 +5,7 @@ from typing import overload
 
 from typing import Self
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
 import polars as pl
@@ -92,8 +93,9 @@ class TimeSeries(TimeSeriesBase):
 
     def to_pandas(self, timezone: str = "UTC") -> pd.Series:
         """Convert to a Pandas Series."""
-        series = pd.Series(self.data, name=self.name, index=self.index)
-        series.index = pd.to_datetime(series.index, utc=True)
+        # Convert the lists in one pass each: missing values become NaN in a float64 array
+        index = pd.to_datetime(self.index, utc=True)
+        series = pd.Series(np.asarray(self.data, dtype=np.float64), name=self.name, index=index)
         return series.tz_convert(timezone)
 
     @classmethod